@@ -6,12 +6,18 @@ Fetches Letterboxd ratings for each movie
 Automatically handles current + next month
 """
 
-import requests
-from bs4 import BeautifulSoup
-import json
+import aiohttp
+import asyncio
+import calendar
+from aiohttp_client_cache import CachedSession, SQLiteBackend
+from bs4 import BeautifulSoup, SoupStrainer
+import lxml.html
+import orjson
 import re
-import time
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import lru_cache
+from operator import itemgetter
+import unicodedata
 from pathlib import Path
 
 MONTHS = [
@@ -19,10 +25,74 @@ MONTHS = [
     "july", "august", "september", "october", "november", "december"
 ]
 
+# Month name -> number for fast '%B %d, %Y' parsing (strptime re-parses
+# its format string and consults locale machinery on every call)
+MONTH_NUM = {m.capitalize(): i + 1 for i, m in enumerate(MONTHS)}
+
 # TMDB API for posters
 TMDB_API_KEY = "3f9482f67e4249d66b4df84f2fa62c99"
 TMDB_IMAGE_BASE = "https://image.tmdb.org/t/p/w154"
 
+# Bound total in-flight requests so concurrent fetches don't hammer any host
+FETCH_SEMAPHORE = asyncio.Semaphore(20)
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=30)
+API_TIMEOUT = aiohttp.ClientTimeout(total=10)
+USER_AGENT = 'Mozilla/5.0 (compatible; StreamingCalendar/1.0)'
+
+TMDB_HOST = 'api.themoviedb.org'
+LETTERBOXD_HOST = 'letterboxd.com'
+WTS_HOST = 'whentostream.com'
+
+class RateLimiter:
+    """Per-host request pacing: acquire() reserves the host's next free
+    slot and sleeps only if that slot is still in the future, so requests
+    interleave up to each host's rate instead of sleeping unconditionally."""
+
+    def __init__(self, rates: dict, default_rate: float = 3.0):
+        self._rates = rates
+        self._default = default_rate
+        self._next_slot = {}
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, host: str):
+        interval = 1.0 / self._rates.get(host, self._default)
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def penalize(self, host: str, retry_after=None):
+        """Push the host's next slot out after a 429."""
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            delay = 5.0
+        now = asyncio.get_running_loop().time()
+        self._next_slot[host] = max(self._next_slot.get(host, now), now + delay)
+
+RATE_LIMITER = RateLimiter({
+    LETTERBOXD_HOST: 3.0,   # be nice to their servers
+    TMDB_HOST: 30.0,        # TMDB's documented limit is well above this
+})
+
+async def reserve_slot(session: aiohttp.ClientSession, host: str, url: str, **kwargs):
+    """Reserve a rate-limit slot only when the request will actually hit the
+    network; responses the disk cache can serve come back without pacing, so
+    a warm run doesn't serialize on sleeps it doesn't need.
+
+    has_url() is only a key-presence test and would also match expired
+    entries (which still trigger a full refetch), so read the stored
+    response instead: get_response() drops expired entries and returns
+    None, and only a still-fresh hit skips pacing."""
+    cache = getattr(session, 'cache', None)
+    if cache is not None:
+        key = cache.create_key('GET', url, **kwargs)
+        if await cache.get_response(key) is not None:
+            return
+    await RATE_LIMITER.acquire(host)
+
 PLATFORM_PATTERNS = {
     "Netflix": r"\(Netflix\)",
     "Prime Video": r"\(Prime Video\)",
@@ -41,250 +111,384 @@ PLATFORM_PATTERNS = {
     "Tubi": r"\(Tubi\)",
 }
 
+# Fuse all platform patterns into one alternation so each line is scanned
+# once instead of once per platform. Group names can't hold '+'/space/'/',
+# so use positional names and map back to the display name.
+PLATFORM_GROUPS = {f"p{i}": name for i, name in enumerate(PLATFORM_PATTERNS)}
+PLATFORM_RE = re.compile(
+    "|".join(f"(?P<p{i}>{pattern})" for i, pattern in enumerate(PLATFORM_PATTERNS.values())),
+    re.IGNORECASE
+)
+
+# Slug building (title_to_letterboxd_slug): one table drops punctuation
+# and maps dashes/whitespace to hyphens in a single C-level pass
+YEAR_SUFFIX_RE = re.compile(r'\s*\(\d{4}\)\s*$')
+SLUG_TABLE = str.maketrans({
+    '–': '-', '—': '-', ' ': '-', '\t': '-', '\n': '-', '\r': '-',
+    ':': None, "'": None, '"': None, '!': None, '?': None, ',': None, '.': None,
+})
+HYPHEN_RUN_RE = re.compile(r'-{2,}')
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Date / page parsing
+ORDINAL_RE = re.compile(r'(\d+)(st|nd|rd|th)')
+LB_RATING_RE = re.compile(r'<meta[^>]+name="twitter:data2"[^>]+content="([\d.]+)\s*out of', re.IGNORECASE)
+LB_POSTER_RE = re.compile(r'<meta[^>]+property="og:image"[^>]+content="([^"]+)"', re.IGNORECASE)
+LB_IMG_RE = re.compile(r'<img[^>]+class="[^"]*\bimage\b[^"]*"[^>]+src="([^"]+)"', re.IGNORECASE)
+# One alternation covers every movie-page line of interest so the page
+# text is scanned once instead of once per field
+DETAILS_RE = re.compile(
+    r'SVOD Release Date:\s*(?P<svod_date>\w+ \d+, \d+)\s*\((?P<svod_platform>[^)]+)\)'
+    r'|VOD Release Date:\s*(?P<vod_date>\w+ \d+, \d+)'
+    r'|(?P<dist>Distributor[^\n]*)'
+    r'|Synopsis:\s*(?P<syn>[^\n]+)'
+)
+MOVIE_LINK_RE = re.compile(r'-\d{4}/$')
+URL_YEAR_RE = re.compile(r'-\d{4}$')
+NON_WORD_RE = re.compile(r'[^\w\s]')
+
+# Keyword -> display name for the Distributor line, in precedence order
+DISTRIBUTOR_MAP = (
+    ('MUBI', 'MUBI'),
+    ('Netflix', 'Netflix'),
+    ('Hulu', 'Hulu'),
+    ('Amazon', 'Prime Video'),
+    ('Prime', 'Prime Video'),
+    ('HBO', 'HBO Max'),
+    ('Max', 'HBO Max'),
+    ('Starz', 'Starz'),
+)
+
+# Only the tags each page is actually queried for need to be parsed
+LINK_STRAINER = SoupStrainer('a', href=True)
+
+# In-process memo for the async fetchers (lru_cache can't wrap coroutines);
+# the streaming and theatrical arms often look up the same titles.
+RATING_CACHE = {}
+POSTER_CACHE = {}
+
+# Posters already returned by the theatrical /discover sweep, keyed by
+# normalized title; consulted before any per-title /search/movie call
+DISCOVER_POSTERS = {}
+
+# Slugs that 404'd on every candidate URL in past runs (gibberish titles,
+# TV shows, etc.) never start existing; skip them outright next time
+KNOWN_404_FILE = Path(__file__).parent / "data" / "letterboxd_404.json"
+
+def load_known_404() -> set:
+    try:
+        return set(orjson.loads(KNOWN_404_FILE.read_bytes()))
+    except (OSError, orjson.JSONDecodeError):
+        return set()
+
+def save_known_404():
+    KNOWN_404_FILE.write_bytes(orjson.dumps(sorted(KNOWN_404)))
+
+KNOWN_404 = load_known_404()
+
 def get_preview_url(month: str, year: int) -> str:
     return f"https://whentostream.com/when-to-streams-{month}-{year}-preview/"
 
 def get_calendar_url(month: str, year: int) -> str:
     return f"https://whentostream.com/streaming-{month}-{year}/"
 
+def normalize_title(title: str) -> str:
+    """Normalize a title into a dedup key: NFKD-fold, strip punctuation."""
+    key = NON_WORD_RE.sub('', unicodedata.normalize('NFKD', title).casefold())
+    return WHITESPACE_RE.sub(' ', key).strip()
+
+def parse_long_date(date_str: str) -> str:
+    """Parse 'January 9, 2026' to '2026-01-09' via the month lookup table."""
+    try:
+        mon, day, year = date_str.replace(',', '').split()
+        return f"{int(year)}-{MONTH_NUM[mon]:02d}-{int(day):02d}"
+    except (KeyError, ValueError):
+        return None
+
+@lru_cache(maxsize=4096)
 def title_to_letterboxd_slug(title: str) -> str:
     """Convert movie title to Letterboxd URL slug."""
-    # Remove year if present at end
-    title = re.sub(r'\s*\(\d{4}\)\s*$', '', title)
-    # Convert to lowercase, replace spaces/special chars with hyphens
-    slug = title.lower()
-    slug = re.sub(r"[:'\"!?,.]", '', slug)  # Remove punctuation
-    slug = re.sub(r'[–—]', '-', slug)  # Normalize dashes
-    slug = re.sub(r'\s+', '-', slug)  # Spaces to hyphens
-    slug = re.sub(r'-+', '-', slug)  # Multiple hyphens to single
-    slug = slug.strip('-')
-    return slug
-
-def get_tmdb_theatrical_releases(start_date: str, end_date: str) -> list:
+    # Strip trailing year, then one translate pass handles punctuation and
+    # separators; only runs of resulting hyphens need a regex collapse
+    title = YEAR_SUFFIX_RE.sub('', title).lower().translate(SLUG_TABLE)
+    return HYPHEN_RUN_RE.sub('-', title).strip('-')
+
+async def get_tmdb_theatrical_releases(session: aiohttp.ClientSession, start_date: str, end_date: str) -> list:
     """Fetch theatrical releases from TMDB for a date range."""
     releases = []
-    
+
     # Get the year from start_date to filter out re-releases
     target_year = int(start_date[:4])
-    
+
     # Sort by popularity to get the notable releases first
     url = f"https://api.themoviedb.org/3/discover/movie?api_key={TMDB_API_KEY}"
     url += f"&region=US&with_release_type=2|3"  # 2=Limited, 3=Theatrical
     url += f"&release_date.gte={start_date}&release_date.lte={end_date}"
     url += f"&sort_by=popularity.desc"
-    
+
     page = 1
     while page <= 3:  # Get top 60 most popular
         page_url = url + f"&page={page}"
-        
+
         try:
-            response = requests.get(page_url, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                
-                for movie in data.get('results', []):
-                    release_date = movie.get('release_date', '')
-                    if not release_date:
-                        continue
-                    
-                    # Skip any movie not from current/next year
-                    movie_year = int(release_date[:4]) if release_date else 0
-                    if movie_year < 2025:
-                        print(f"  Skipping old movie: {movie.get('title')} ({movie_year})")
-                        continue
-                    
-                    # Skip re-releases: high vote count means it's an old classic
-                    vote_count = movie.get('vote_count', 0)
-                    if vote_count > 1000:
-                        print(f"  Skipping likely re-release: {movie.get('title')} (votes: {vote_count})")
-                        continue
-                    
-                    # Get poster
-                    poster_path = movie.get('poster_path')
-                    poster_url = f"{TMDB_IMAGE_BASE}{poster_path}" if poster_path else None
-                    
-                    # Better wide vs limited detection based on popularity
-                    popularity = movie.get('popularity', 0)
-                    # Wide releases typically have popularity > 10 before release
-                    # Major blockbusters have 30+
-                    if popularity > 25:
-                        release_type = "Wide Release"
-                    elif popularity > 8:
-                        release_type = "Wide Release"  # Moderate wide releases
-                    else:
-                        release_type = "Limited"
-                    
-                    releases.append({
-                        'title': movie.get('title', ''),
-                        'date': release_date,
-                        'platform': release_type,
-                        'synopsis': movie.get('overview', ''),
-                        'type': 'theatrical',
-                        'poster': poster_url,
-                        'tmdb_id': movie.get('id'),
-                        'letterboxd_rating': None,
-                        'letterboxd_url': None
-                    })
-                
-                if page >= data.get('total_pages', 1):
-                    break
-                page += 1
-            else:
+            await reserve_slot(session, TMDB_HOST, page_url)
+            async with FETCH_SEMAPHORE:
+                async with session.get(page_url, timeout=API_TIMEOUT) as response:
+                    if response.status != 200:
+                        break
+                    data = await response.json()
+
+            for movie in data.get('results', []):
+                release_date = movie.get('release_date', '')
+                if not release_date:
+                    continue
+
+                # Skip any movie not from current/next year
+                movie_year = int(release_date[:4]) if release_date else 0
+                if movie_year < 2025:
+                    print(f"  Skipping old movie: {movie.get('title')} ({movie_year})")
+                    continue
+
+                # Skip re-releases: high vote count means it's an old classic
+                vote_count = movie.get('vote_count', 0)
+                if vote_count > 1000:
+                    print(f"  Skipping likely re-release: {movie.get('title')} (votes: {vote_count})")
+                    continue
+
+                # Get poster; remember it so streaming titles matching a
+                # discovered movie don't need a /search/movie round-trip
+                poster_path = movie.get('poster_path')
+                poster_url = f"{TMDB_IMAGE_BASE}{poster_path}" if poster_path else None
+                if poster_url:
+                    DISCOVER_POSTERS.setdefault(normalize_title(movie.get('title', '')), poster_url)
+
+                # Better wide vs limited detection based on popularity
+                popularity = movie.get('popularity', 0)
+                # Wide releases typically have popularity > 10 before release
+                # Major blockbusters have 30+
+                if popularity > 25:
+                    release_type = "Wide Release"
+                elif popularity > 8:
+                    release_type = "Wide Release"  # Moderate wide releases
+                else:
+                    release_type = "Limited"
+
+                releases.append({
+                    'title': movie.get('title', ''),
+                    'date': release_date,
+                    'platform': release_type,
+                    'synopsis': movie.get('overview', ''),
+                    'type': 'theatrical',
+                    'poster': poster_url,
+                    'tmdb_id': movie.get('id'),
+                    'letterboxd_rating': None,
+                    'letterboxd_url': None
+                })
+
+            # Results are popularity-sorted, so once the tail of a page dips
+            # below the "Limited" threshold every later page is noise
+            results = data.get('results', [])
+            if results and results[-1].get('popularity', 0) < 8:
+                break
+
+            if page >= data.get('total_pages', 1):
                 break
+            page += 1
         except Exception as e:
             print(f"Error fetching TMDB page {page}: {e}")
             break
-        
-        time.sleep(0.25)  # Rate limiting
-    
+
     return releases
 
 
-def get_tmdb_poster(title: str, year: str = None) -> str:
-    """Fetch poster URL from TMDB."""
+async def get_tmdb_poster_by_id(session: aiohttp.ClientSession, tmdb_id: int) -> str:
+    """Fetch poster URL from TMDB by movie id (direct lookup, no search)."""
     try:
-        # Search for the movie
-        search_url = f"https://api.themoviedb.org/3/search/movie?api_key={TMDB_API_KEY}&query={requests.utils.quote(title)}"
+        movie_url = f"https://api.themoviedb.org/3/movie/{tmdb_id}?api_key={TMDB_API_KEY}"
+        await reserve_slot(session, TMDB_HOST, movie_url)
+        async with FETCH_SEMAPHORE:
+            async with session.get(movie_url, timeout=API_TIMEOUT) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    poster_path = data.get('poster_path')
+                    if poster_path:
+                        return f"{TMDB_IMAGE_BASE}{poster_path}"
+    except Exception as e:
+        pass
+
+    return None
+
+async def get_tmdb_poster(session: aiohttp.ClientSession, title: str, year: str = None) -> str:
+    """Fetch poster URL from TMDB (memoized per title/year)."""
+    key = (title, year)
+    if key not in POSTER_CACHE:
+        discovered = DISCOVER_POSTERS.get(normalize_title(title))
+        if discovered:
+            POSTER_CACHE[key] = discovered
+        else:
+            POSTER_CACHE[key] = await _fetch_tmdb_poster(session, title, year)
+    return POSTER_CACHE[key]
+
+async def _fetch_tmdb_poster(session: aiohttp.ClientSession, title: str, year: str) -> str:
+    try:
+        # Search for the movie; params= lets aiohttp do the URL encoding
+        params = {'api_key': TMDB_API_KEY, 'query': title}
         if year:
-            search_url += f"&year={year}"
-        
-        response = requests.get(search_url, timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('results') and len(data['results']) > 0:
-                poster_path = data['results'][0].get('poster_path')
-                if poster_path:
-                    return f"{TMDB_IMAGE_BASE}{poster_path}"
+            params['year'] = year
+
+        await reserve_slot(session, TMDB_HOST, "https://api.themoviedb.org/3/search/movie",
+                           params=params)
+        async with FETCH_SEMAPHORE:
+            async with session.get("https://api.themoviedb.org/3/search/movie",
+                                   params=params, timeout=API_TIMEOUT) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    if data.get('results') and len(data['results']) > 0:
+                        poster_path = data['results'][0].get('poster_path')
+                        if poster_path:
+                            return f"{TMDB_IMAGE_BASE}{poster_path}"
     except Exception as e:
         pass
-    
+
     return None
 
-def get_letterboxd_rating(title: str, year: str = None) -> dict:
-    """Fetch Letterboxd rating and poster for a movie."""
+async def get_letterboxd_rating(session: aiohttp.ClientSession, title: str, year: str = None) -> dict:
+    """Fetch Letterboxd rating and poster for a movie (memoized per title/year)."""
+    key = (title, year)
+    if key not in RATING_CACHE:
+        RATING_CACHE[key] = await _fetch_letterboxd_rating(session, title, year)
+    return RATING_CACHE[key]
+
+async def _fetch_letterboxd_rating(session: aiohttp.ClientSession, title: str, year: str) -> dict:
     slug = title_to_letterboxd_slug(title)
-    
+
+    # Empty, single-char, or numeric-only slugs are never real films;
+    # don't spend round-trips finding that out
+    if len(slug) < 2 or slug.replace('-', '').isdigit():
+        return None
+
+    if slug in KNOWN_404:
+        return None
+
     # Try with year suffix first if provided
     urls_to_try = [f"https://letterboxd.com/film/{slug}/"]
     if year:
         urls_to_try.insert(0, f"https://letterboxd.com/film/{slug}-{year}/")
-    
+
     headers = {
         'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
     }
-    
+
+    # Only worth retrying the bare slug after a 404 if it looks like words
+    # rather than calendar-page mangling
+    plausible_slug = any(len(token) > 2 and token.isalpha() for token in slug.split('-'))
+
+    all_404 = True
     for url in urls_to_try:
         try:
-            response = requests.get(url, headers=headers, timeout=10)
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
+            await reserve_slot(session, LETTERBOXD_HOST, url)
+            async with FETCH_SEMAPHORE:
+                async with session.get(url, headers=headers, timeout=API_TIMEOUT) as response:
+                    status = response.status
+                    # All three scraped sites serve UTF-8; decoding directly
+                    # skips aiohttp's charset detection fallback
+                    html = await response.text(encoding='utf-8', errors='replace') if status == 200 else None
+                    if status == 429:
+                        # Honor Retry-After before the next Letterboxd call
+                        RATE_LIMITER.penalize(LETTERBOXD_HOST, response.headers.get('Retry-After'))
+
+            if status != 404:
+                all_404 = False
+            elif not plausible_slug:
+                # Not worth the bare-slug retry, but a single one-sided 404
+                # doesn't prove the film is absent — leave KNOWN_404 alone
+                return None
+
+            if html:
                 result = {'url': url, 'rating': None, 'poster': None}
-                
-                # Get rating from meta tags
-                rating_meta = soup.find('meta', {'name': 'twitter:data2'})
-                if rating_meta:
-                    rating_text = rating_meta.get('content', '')
-                    match = re.search(r'([\d.]+)\s*out of', rating_text)
-                    if match:
-                        result['rating'] = float(match.group(1))
-                
-                # Get poster from og:image meta tag
-                poster_meta = soup.find('meta', {'property': 'og:image'})
-                if poster_meta:
-                    poster_url = poster_meta.get('content', '')
-                    if poster_url and 'letterboxd' in poster_url:
-                        result['poster'] = poster_url
-                
+
+                # Only two meta tags (plus an img fallback) are needed, so
+                # regex the raw HTML instead of building a parse tree
+                match = LB_RATING_RE.search(html)
+                if match:
+                    result['rating'] = float(match.group(1))
+
+                match = LB_POSTER_RE.search(html)
+                if match and 'letterboxd' in match.group(1):
+                    result['poster'] = match.group(1)
+
                 # Alternative: look for poster in the page
                 if not result['poster']:
-                    poster_img = soup.find('img', class_='image')
-                    if poster_img:
-                        result['poster'] = poster_img.get('src', '')
-                
+                    match = LB_IMG_RE.search(html)
+                    if match:
+                        result['poster'] = match.group(1)
+
                 if result['rating'] or result['poster']:
                     return result
-                        
+
         except Exception as e:
-            pass
-        
-        time.sleep(0.3)  # Be nice to their servers
-    
+            all_404 = False
+
+    if all_404:
+        KNOWN_404.add(slug)
     return None
 
 def extract_platform(text: str) -> str:
-    for platform, pattern in PLATFORM_PATTERNS.items():
-        if re.search(pattern, text, re.IGNORECASE):
-            return platform
-    return "Unknown"
+    # Every platform tag ends with ')', so a C-level substring test screens
+    # out the vast majority of lines before any regex work
+    if ')' not in text:
+        return "Unknown"
+    match = PLATFORM_RE.search(text)
+    return PLATFORM_GROUPS[match.lastgroup] if match else "Unknown"
 
 def parse_date_header(text: str) -> str:
     """Parse 'Monday, December 1st, 2025' to '2025-12-01'"""
-    clean = re.sub(r'(\d+)(st|nd|rd|th)', r'\1', text)
+    clean = ORDINAL_RE.sub(r'\1', text)
     try:
-        dt = datetime.strptime(clean.strip(), "%A, %B %d, %Y")
-        return dt.strftime("%Y-%m-%d")
-    except:
+        weekday, rest = clean.split(',', 1)
+    except ValueError:
         return None
+    return parse_long_date(rest.strip())
 
-def scrape_movie_page(url: str) -> dict:
+async def scrape_movie_page(session: aiohttp.ClientSession, url: str) -> dict:
     """Scrape individual movie page for details."""
     try:
-        headers = {'User-Agent': 'Mozilla/5.0 (compatible; StreamingCalendar/1.0)'}
-        response = requests.get(url, timeout=30, headers=headers)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        text = soup.get_text()
-        lines = [l.strip() for l in text.split('\n') if l.strip()]
-        
+        await reserve_slot(session, WTS_HOST, url)
+        async with FETCH_SEMAPHORE:
+            async with session.get(url, timeout=REQUEST_TIMEOUT) as response:
+                html = await response.text(encoding='utf-8', errors='replace')
+        # Only the flattened text is needed here, so skip the BS4 tree and
+        # let lxml extract it directly
+        text = lxml.html.fromstring(html).text_content()
+
         info = {'url': url}
         distributor = None
         svod_date = None
         svod_platform = None
         vod_date = None
-        
-        for line in lines:
-            # Look for SVOD release date with platform (e.g., "SVOD Release Date: January 9, 2026 (Netflix)")
-            if 'SVOD Release Date:' in line:
-                match = re.search(r'SVOD Release Date:\s*(\w+ \d+, \d+)\s*\(([^)]+)\)', line)
-                if match:
-                    date_str = match.group(1)
-                    platform = match.group(2)
-                    try:
-                        dt = datetime.strptime(date_str, "%B %d, %Y")
-                        svod_date = dt.strftime("%Y-%m-%d")
-                        svod_platform = platform
-                    except:
-                        pass
-            
-            # Also check VOD Release Date (e.g., "VOD Release Date: December 9, 2025")
-            if 'VOD Release Date:' in line:
-                match = re.search(r'VOD Release Date:\s*(\w+ \d+, \d+)', line)
-                if match:
-                    date_str = match.group(1)
-                    try:
-                        dt = datetime.strptime(date_str, "%B %d, %Y")
-                        vod_date = dt.strftime("%Y-%m-%d")
-                    except:
-                        pass
-            
+
+        # One C-level scan of the page text finds every line of interest
+        # (e.g., "SVOD Release Date: January 9, 2026 (Netflix)")
+        for match in DETAILS_RE.finditer(text):
+            if match.group('svod_date'):
+                date = parse_long_date(match.group('svod_date'))
+                if date:
+                    svod_date = date
+                    svod_platform = match.group('svod_platform')
+
+            elif match.group('vod_date'):
+                date = parse_long_date(match.group('vod_date'))
+                if date:
+                    vod_date = date
+
             # Capture distributor
-            if 'Distributor' in line:
-                if 'MUBI' in line:
-                    distributor = 'MUBI'
-                elif 'Netflix' in line:
-                    distributor = 'Netflix'
-                elif 'Hulu' in line:
-                    distributor = 'Hulu'
-                elif 'Amazon' in line or 'Prime' in line:
-                    distributor = 'Prime Video'
-                elif 'HBO' in line or 'Max' in line:
-                    distributor = 'HBO Max'
-                elif 'Starz' in line:
-                    distributor = 'Starz'
-            
-            if 'Synopsis:' in line:
-                info['synopsis'] = line.replace('Synopsis:', '').strip()
-        
+            elif match.group('dist'):
+                line = match.group('dist')
+                distributor = next((name for key, name in DISTRIBUTOR_MAP if key in line), distributor)
+
+            elif match.group('syn'):
+                info['synopsis'] = match.group('syn').strip()
+
         # Prefer SVOD date/platform, fall back to VOD
         if svod_date and svod_platform:
             info['date'] = svod_date
@@ -292,60 +496,72 @@ def scrape_movie_page(url: str) -> dict:
         elif vod_date:
             info['date'] = vod_date
             info['platform'] = distributor if distributor else 'VOD/Digital'
-        
+
         return info
     except Exception as e:
         print(f"    Error fetching {url}: {e}")
         return None
 
-def scrape_calendar_page(month: str, year: int) -> list:
+async def scrape_calendar_page(session: aiohttp.ClientSession, month: str, year: int) -> list:
     """Scrape the calendar-style page for movie links, then fetch each movie page."""
     url = get_calendar_url(month, year)
     print(f"Fetching calendar page: {url}")
-    
+
     # Build target month prefix for filtering (e.g., "2026-01")
     month_num = MONTHS.index(month.lower()) + 1
     target_prefix = f"{year}-{month_num:02d}"
-    
+
     try:
-        headers = {'User-Agent': 'Mozilla/5.0 (compatible; StreamingCalendar/1.0)'}
-        response = requests.get(url, timeout=30, headers=headers)
-        response.raise_for_status()
+        await reserve_slot(session, WTS_HOST, url)
+        async with FETCH_SEMAPHORE:
+            async with session.get(url, timeout=REQUEST_TIMEOUT) as response:
+                response.raise_for_status()
+                html = await response.text(encoding='utf-8', errors='replace')
     except Exception as e:
         print(f"  Failed: {e}")
         return []
-    
-    soup = BeautifulSoup(response.text, 'html.parser')
-    
+
+    soup = BeautifulSoup(html, 'lxml', parse_only=LINK_STRAINER)
+
     # Find movie page links - look for URLs ending in -YYYY/ pattern (any year)
     movie_urls = []
+    seen_urls = set()  # constant-time membership; the list keeps page order
     for link in soup.find_all('a', href=True):
         href = link.get('href', '')
         # Skip non-movie pages
         if any(x in href for x in ['streaming-', 'theaters-', 'archive', 'category', 'author', 'share=', 'whats-streaming', 'preview']):
             continue
         # Check if it looks like a movie page (ends with -YYYY/)
-        if 'whentostream.com/' in href and re.search(r'-\d{4}/$', href):
-            if href not in movie_urls:
+        if 'whentostream.com/' in href and MOVIE_LINK_RE.search(href):
+            if href not in seen_urls:
+                seen_urls.add(href)
                 movie_urls.append(href)
-    
+
     print(f"  Found {len(movie_urls)} movie links")
-    
+
+    # Fetch all movie pages concurrently (bounded by FETCH_SEMAPHORE)
+    movie_infos = await asyncio.gather(
+        *(scrape_movie_page(session, movie_url) for movie_url in movie_urls),
+        return_exceptions=True
+    )
+
     releases = []
-    for movie_url in movie_urls:
+    for movie_url, movie_info in zip(movie_urls, movie_infos):
         # Extract title from URL
         title = movie_url.split('/')[-2]
-        title = re.sub(r'-\d{4}$', '', title)  # Remove year
+        title = URL_YEAR_RE.sub('', title)  # Remove year
         title = title.replace('-', ' ').title()
-        
-        print(f"    Fetching: {title}")
-        movie_info = scrape_movie_page(movie_url)
-        
+
+        if isinstance(movie_info, Exception):
+            print(f"    Error fetching {title}: {movie_info}")
+            continue
+
         if movie_info and movie_info.get('date') and movie_info.get('platform'):
             # Only include if the date is in the target month
             if movie_info['date'].startswith(target_prefix):
                 releases.append({
                     'title': title,
+                    '_k': normalize_title(title),
                     'date': movie_info['date'],
                     'platform': movie_info['platform'],
                     'synopsis': movie_info.get('synopsis', ''),
@@ -353,138 +569,168 @@ def scrape_calendar_page(month: str, year: int) -> list:
                 })
             else:
                 print(f"      Skipping: date {movie_info['date']} not in {target_prefix}")
-        
-        time.sleep(0.3)  # Rate limiting
-    
+
     return releases
 
-def scrape_streaming_month(month: str, year: int) -> list:
+async def scrape_streaming_month(session: aiohttp.ClientSession, month: str, year: int) -> list:
     """Scrape streaming releases for a given month from the calendar page."""
-    return scrape_calendar_page(month, year)
+    return await scrape_calendar_page(session, month, year)
 
 def get_months_to_scrape():
     """Get current month and next month."""
     now = datetime.now()
     months = []
-    
+
     for offset in [0, 1]:
         month_idx = (now.month - 1 + offset) % 12
         year = now.year + ((now.month + offset - 1) // 12)
         months.append((MONTHS[month_idx], year))
-    
+
     return months
 
-def main():
+async def enrich_streaming_release(session: aiohttp.ClientSession, release: dict):
+    """Fetch Letterboxd rating and TMDB poster for a streaming release."""
+    # Extract year from date
+    year = release['date'][:4] if release.get('date') else None
+
+    # Don't re-search TMDB when the release already carries a poster or a
+    # tmdb_id (theatrical entries from /discover have both)
+    if release.get('poster'):
+        fetch_poster = asyncio.sleep(0, result=release['poster'])
+    elif release.get('tmdb_id'):
+        fetch_poster = get_tmdb_poster_by_id(session, release['tmdb_id'])
+    else:
+        fetch_poster = get_tmdb_poster(session, release['title'], year)
+
+    rating_info, poster_url = await asyncio.gather(
+        get_letterboxd_rating(session, release['title'], year),
+        fetch_poster
+    )
+
+    if rating_info:
+        release['letterboxd_rating'] = rating_info.get('rating')
+        release['letterboxd_url'] = rating_info.get('url')
+    else:
+        release['letterboxd_rating'] = None
+        release['letterboxd_url'] = None
+
+    release['poster'] = poster_url
+
+    rating_str = str(rating_info.get('rating')) if rating_info and rating_info.get('rating') else 'no rating'
+    poster_str = '✓ poster' if poster_url else 'no poster'
+    print(f"  {release['title']}: {rating_str}, {poster_str}")
+
+async def enrich_theatrical_release(session: aiohttp.ClientSession, release: dict):
+    """Fetch Letterboxd rating for a theatrical release."""
+    year = release['date'][:4] if release.get('date') else None
+    rating_info = await get_letterboxd_rating(session, release['title'], year)
+
+    if rating_info:
+        release['letterboxd_rating'] = rating_info.get('rating')
+        release['letterboxd_url'] = rating_info.get('url')
+
+async def main():
     output_dir = Path(__file__).parent / "data"
     output_dir.mkdir(exist_ok=True)
-    
-    all_releases = []
-    months = get_months_to_scrape()
-    
-    for month_name, year in months:
-        releases = scrape_streaming_month(month_name, year)
-        all_releases.extend(releases)
-        print(f"  Found {len(releases)} streaming releases for {month_name.title()} {year}")
-    
-    # Deduplicate by normalized title
-    seen = {}
-    for r in all_releases:
-        # Normalize title: lowercase, remove punctuation
-        key = re.sub(r'[^\w\s]', '', r['title'].lower())
-        key = re.sub(r'\s+', ' ', key).strip()
-        
-        if key not in seen:
-            seen[key] = r
-        else:
+
+    # Cache responses on disk so unchanged Letterboxd/TMDB pages cost nothing
+    # on the next scheduled run; 404s are cached too so known-missing slugs
+    # aren't retried every time. (No cache_control: aiohttp-client-cache only
+    # sends conditional requests with per-request refresh=True, so the flag
+    # wouldn't buy 304 revalidation — its only effect would be letting a
+    # no-store response header silently disable caching for these hosts.)
+    cache = SQLiteBackend(
+        cache_name=str(Path(__file__).parent / "scraper_cache"),
+        expire_after=timedelta(hours=12),
+        allowed_codes=(200, 404),
+    )
+    # keepalive_timeout keeps warm TLS connections around between the
+    # scrape, enrichment, and theatrical phases
+    connector = aiohttp.TCPConnector(limit_per_host=8, keepalive_timeout=30)
+    async with CachedSession(
+        cache=cache,
+        connector=connector,
+        headers={'User-Agent': USER_AGENT},
+        timeout=REQUEST_TIMEOUT,
+    ) as session:
+        months = get_months_to_scrape()
+
+        # The months are independent, so scrape them concurrently
+        per_month = await asyncio.gather(
+            *(scrape_streaming_month(session, month_name, year) for month_name, year in months)
+        )
+        all_releases = []
+        for (month_name, year), releases in zip(months, per_month):
+            all_releases.extend(releases)
+            print(f"  Found {len(releases)} streaming releases for {month_name.title()} {year}")
+
+        # Deduplicate by the normalized-title key computed at construction
+        seen = {}
+        for r in all_releases:
+            kept = seen.setdefault(r['_k'], r)
             # If same title, prefer specific platforms over VOD/Digital
-            if seen[key]['platform'] == 'VOD/Digital' and r['platform'] != 'VOD/Digital':
-                seen[key] = r
-    
-    unique = list(seen.values())
-    unique.sort(key=lambda x: x['date'])
-    
-    # Fetch Letterboxd ratings and TMDB posters for each movie
-    print("\nFetching Letterboxd ratings and TMDB posters...")
-    for i, release in enumerate(unique):
-        # Extract year from date
-        year = release['date'][:4] if release.get('date') else None
-        
-        # Get Letterboxd rating
-        rating_info = get_letterboxd_rating(release['title'], year)
-        if rating_info:
-            release['letterboxd_rating'] = rating_info.get('rating')
-            release['letterboxd_url'] = rating_info.get('url')
-        else:
-            release['letterboxd_rating'] = None
-            release['letterboxd_url'] = None
-        
-        # Get TMDB poster
-        poster_url = get_tmdb_poster(release['title'], year)
-        release['poster'] = poster_url
-        
-        rating_str = str(rating_info.get('rating')) if rating_info and rating_info.get('rating') else 'no rating'
-        poster_str = '✓ poster' if poster_url else 'no poster'
-        print(f"  {release['title']}: {rating_str}, {poster_str}")
-        
-        # Progress indicator
-        if (i + 1) % 10 == 0:
-            print(f"  [{i + 1}/{len(unique)} complete]")
-    
-    data = {
-        "last_updated": datetime.now().isoformat(),
-        "months": [{"name": m.title(), "year": y} for m, y in months],
-        "releases": unique,
-        "theatrical": []
-    }
-    
-    # Fetch theatrical releases from TMDB
-    print("\nFetching theatrical releases from TMDB...")
-    theatrical_releases = []
-    for month_name, year in months:
-        month_num = MONTHS.index(month_name.lower()) + 1
-        # Get first and last day of month
-        start_date = f"{year}-{month_num:02d}-01"
-        if month_num == 12:
-            end_date = f"{year}-12-31"
-        else:
-            end_date = f"{year}-{month_num:02d}-28"  # Safe end date
-        
-        month_releases = get_tmdb_theatrical_releases(start_date, end_date)
-        theatrical_releases.extend(month_releases)
-        print(f"  Found {len(month_releases)} theatrical releases for {month_name.title()} {year}")
-    
-    # Deduplicate theatrical
-    seen_theatrical = set()
-    unique_theatrical = []
-    for r in theatrical_releases:
-        key = (r['title'].lower(), r['date'])
-        if key not in seen_theatrical:
-            seen_theatrical.add(key)
-            unique_theatrical.append(r)
-    
-    unique_theatrical.sort(key=lambda x: x['date'])
-    
-    # Fetch Letterboxd ratings for theatrical releases
-    print("\nFetching Letterboxd ratings for theatrical releases...")
-    for i, release in enumerate(unique_theatrical):
-        year = release['date'][:4] if release.get('date') else None
-        rating_info = get_letterboxd_rating(release['title'], year)
-        
-        if rating_info:
-            release['letterboxd_rating'] = rating_info.get('rating')
-            release['letterboxd_url'] = rating_info.get('url')
-        
-        if (i + 1) % 10 == 0:
-            print(f"  [{i + 1}/{len(unique_theatrical)} complete]")
-    
-    data["theatrical"] = unique_theatrical
-    print(f"  Total theatrical: {len(unique_theatrical)}")
-    
+            if kept is not r and kept['platform'] == 'VOD/Digital' and r['platform'] != 'VOD/Digital':
+                seen[r['_k']] = r
+
+        unique = sorted(seen.values(), key=itemgetter('date'))
+
+        # The dedup key is internal; keep it out of the JSON
+        for r in unique:
+            del r['_k']
+
+        # Fetch theatrical releases from TMDB first: the /discover sweep
+        # fills DISCOVER_POSTERS, sparing per-title searches for streaming
+        # titles that overlap. Both months run concurrently.
+        print("\nFetching theatrical releases from TMDB...")
+        month_ranges = []
+        for month_name, year in months:
+            month_num = MONTHS.index(month_name.lower()) + 1
+            # Get first and last day of month
+            start_date = f"{year}-{month_num:02d}-01"
+            last_day = calendar.monthrange(year, month_num)[1]
+            end_date = f"{year}-{month_num:02d}-{last_day:02d}"
+            month_ranges.append((start_date, end_date))
+
+        per_month_theatrical = await asyncio.gather(
+            *(get_tmdb_theatrical_releases(session, start, end) for start, end in month_ranges)
+        )
+        theatrical_releases = []
+        for (month_name, year), month_releases in zip(months, per_month_theatrical):
+            theatrical_releases.extend(month_releases)
+            print(f"  Found {len(month_releases)} theatrical releases for {month_name.title()} {year}")
+
+        # Deduplicate theatrical; dict insertion order keeps first-seen wins
+        seen_theatrical = {}
+        for r in theatrical_releases:
+            seen_theatrical.setdefault((r['title'].lower(), r['date']), r)
+
+        unique_theatrical = sorted(seen_theatrical.values(), key=itemgetter('date'))
+
+        # Fetch Letterboxd ratings and TMDB posters for each movie concurrently
+        print("\nFetching Letterboxd ratings and TMDB posters...")
+        await asyncio.gather(*(enrich_streaming_release(session, r) for r in unique))
+
+        data = {
+            # orjson serializes datetime natively (RFC 3339)
+            "last_updated": datetime.now(),
+            "months": [{"name": m.title(), "year": y} for m, y in months],
+            "releases": unique,
+            "theatrical": []
+        }
+
+        # Fetch Letterboxd ratings for theatrical releases concurrently
+        print("\nFetching Letterboxd ratings for theatrical releases...")
+        await asyncio.gather(*(enrich_theatrical_release(session, r) for r in unique_theatrical))
+
+        data["theatrical"] = unique_theatrical
+        print(f"  Total theatrical: {len(unique_theatrical)}")
+
+    save_known_404()
+
     output_file = output_dir / "releases.json"
-    with open(output_file, 'w') as f:
-        json.dump(data, f, indent=2)
-    
+    output_file.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS))
+
     print(f"\nSaved {len(unique)} total releases to {output_file}")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())